@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict
+from functools import cached_property
 from uuid import uuid4
 
 from agentic_ai.config import Settings
@@ -22,10 +22,18 @@ class AgricultureResearchAgent:
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
         self.store = SQLiteStore(settings.sqlite_path)
-        self.search_tool = self._build_search_tool()
-        self.summarizer = OllamaSummarizer(settings.ollama_model)
 
-    def _build_search_tool(self) -> SearchTool:
+    @cached_property
+    def summarizer(self) -> OllamaSummarizer:
+        """Ollama summarizer, built on first use to keep LangChain imports off startup."""
+        return OllamaSummarizer(
+            self.settings.ollama_model,
+            cache=self.store,
+            embedding_model=self.settings.summary_embedding_model,
+        )
+
+    @cached_property
+    def search_tool(self) -> SearchTool:
         """Build search provider with fallback behavior."""
         if self.settings.search_provider.lower() == "google":
             return GoogleProgrammableSearchTool(
@@ -34,6 +42,11 @@ class AgricultureResearchAgent:
             )
         return DuckDuckGoSearchTool()
 
+    @cached_property
+    def fallback_search_tool(self) -> SearchTool:
+        """DuckDuckGo tool used when Google returns nothing; kept to reuse its session."""
+        return DuckDuckGoSearchTool()
+
     def build_plan(self, goal: str) -> list[str]:
         """Return deterministic decomposition for the requested goal."""
         return [
@@ -53,25 +66,23 @@ class AgricultureResearchAgent:
         query = "recent AI research papers in agriculture arxiv journal"
         raw_results = self.search_tool.search(query=query, max_results=self.settings.search_max_results)
         if not raw_results and self.settings.search_provider.lower() == "google":
-            raw_results = DuckDuckGoSearchTool().search(
+            raw_results = self.fallback_search_tool.search(
                 query=query,
                 max_results=self.settings.search_max_results,
             )
 
         selected = pick_top_recent(raw_results, k=3)
-        papers: list[PaperRecord] = []
-        for item in selected:
-            summary = self.summarizer.summarize(item)
-            papers.append(
-                PaperRecord(
-                    title=item.title,
-                    url=item.url,
-                    year=item.year,
-                    summary=summary,
-                    raw=asdict(item),
-                )
+        summaries = self.summarizer.summarize_many(selected)
+        papers = [
+            PaperRecord(
+                title=item.title,
+                url=item.url,
+                year=item.year,
+                summary=summary,
+                raw=item.to_dict(),
             )
+            for item, summary in zip(selected, summaries)
+        ]
 
-        self.store.store_papers(job_id, papers)
-        self.store.update_job_status(job_id, "completed")
+        self.store.finalize_job(job_id, "completed", papers)
         return self.store.fetch_job_report(job_id)
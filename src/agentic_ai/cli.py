@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import json
-
+import orjson
 import typer
 
 from .agent import AgricultureResearchAgent
@@ -23,7 +22,7 @@ def run(
     """Run the full workflow for a user and print structured JSON output."""
     agent = AgricultureResearchAgent(settings)
     result = agent.run(user_id=user_id, goal=goal)
-    typer.echo(json.dumps(result, indent=2))
+    typer.echo(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
 
 if __name__ == "__main__":
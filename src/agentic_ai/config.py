@@ -4,7 +4,7 @@ from dataclasses import dataclass
 import os
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Settings:
     """Application settings loaded from environment variables."""
 
@@ -14,6 +14,7 @@ class Settings:
     search_provider: str = os.getenv("SEARCH_PROVIDER", "google")
     google_cse_id: str = os.getenv("GOOGLE_CSE_ID", "")
     google_api_key: str = os.getenv("GOOGLE_API_KEY", "")
+    summary_embedding_model: str = os.getenv("SUMMARY_EMBEDDING_MODEL", "")
 
 
 settings = Settings()
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
+import time
+import zlib
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Iterator
 
+import orjson
+
+RAW_COMPRESSION_LEVEL = 6
+
 
 @dataclass(slots=True)
 class PaperRecord:
@@ -27,25 +32,52 @@ class SQLiteStore:
 
     def __init__(self, db_path: str) -> None:
         self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-20000")
+        self._conn.execute("PRAGMA wal_autocheckpoint=10000")
+        self._conn.execute("PRAGMA mmap_size=268435456")
         self._init_db()
 
     @contextmanager
-    def connect(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        finally:
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        """Serialize a write transaction on the shared connection."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the underlying connection; the store is unusable afterwards."""
+        with self._lock:
+            self._conn.close()
+
+    def __del__(self) -> None:
+        conn = getattr(self, "_conn", None)
+        if conn is not None:
             conn.close()
 
     def _init_db(self) -> None:
-        with self.connect() as conn:
+        # page_size cannot change once in WAL, so fresh and rollback-journal databases
+        # (including ones from before WAL was enabled) are rebuilt with 8 KiB pages once.
+        if self._conn.execute("PRAGMA journal_mode").fetchone()[0] != "wal":
+            self._conn.execute("PRAGMA page_size=8192")
+            self._conn.execute("VACUUM")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._tx() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS users (
                     user_id TEXT PRIMARY KEY,
-                    created_at TEXT NOT NULL
+                    created_at INTEGER NOT NULL
                 )
                 """
             )
@@ -55,10 +87,10 @@ class SQLiteStore:
                     job_id TEXT PRIMARY KEY,
                     user_id TEXT NOT NULL,
                     goal TEXT NOT NULL,
-                    plan_json TEXT NOT NULL,
+                    plan_json TEXT,
                     status TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    updated_at INTEGER NOT NULL,
                     FOREIGN KEY(user_id) REFERENCES users(user_id)
                 )
                 """
@@ -73,61 +105,179 @@ class SQLiteStore:
                     url TEXT NOT NULL,
                     year INTEGER,
                     summary TEXT NOT NULL,
-                    raw_json TEXT NOT NULL,
+                    raw_json BLOB NOT NULL,
+                    FOREIGN KEY(job_id) REFERENCES jobs(job_id)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS plan_steps (
+                    job_id TEXT NOT NULL,
+                    step_no INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY(job_id, step_no),
                     FOREIGN KEY(job_id) REFERENCES jobs(job_id)
                 )
                 """
             )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_papers_job_rank ON papers(job_id, rank_order)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, created_at)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS summaries_cache (
+                    key TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    embedding BLOB,
+                    created_at INTEGER NOT NULL,
+                    PRIMARY KEY(key, prompt_hash)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_summaries_prompt_recent ON summaries_cache(prompt_hash, created_at)"
+            )
+            if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+                self._migrate_iso_timestamps(conn)
+                conn.execute("PRAGMA user_version=1")
+            # Databases created before plan_steps declare plan_json NOT NULL.
+            self._plan_json_required = any(
+                row["name"] == "plan_json" and row["notnull"]
+                for row in conn.execute("PRAGMA table_info(jobs)")
+            )
 
-    def ensure_user(self, user_id: str) -> None:
-        with self.connect() as conn:
+    @staticmethod
+    def _migrate_iso_timestamps(conn: sqlite3.Connection) -> None:
+        """Rewrite ISO timestamps from older databases as unix epochs so ordering stays correct."""
+        for table, column in (("users", "created_at"), ("jobs", "created_at"), ("jobs", "updated_at")):
             conn.execute(
-                "INSERT OR IGNORE INTO users (user_id, created_at) VALUES (?, ?)",
-                (user_id, datetime.utcnow().isoformat()),
+                f"UPDATE {table} SET {column} = CAST(strftime('%s', {column}) AS INTEGER) "
+                f"WHERE typeof({column}) = 'text' AND {column} GLOB '*-*'"
             )
 
+    def ensure_user(self, user_id: str) -> None:
+        with self._tx() as conn:
+            self._insert_user(conn, user_id)
+
     def create_job(self, job_id: str, user_id: str, goal: str, plan: list[str]) -> None:
-        self.ensure_user(user_id)
-        now = datetime.utcnow().isoformat()
-        with self.connect() as conn:
+        """Register the user (if new) and the running job in one transaction."""
+        now = int(time.time())
+        with self._tx() as conn:
+            self._insert_user(conn, user_id, now)
             conn.execute(
                 """
                 INSERT INTO jobs (job_id, user_id, goal, plan_json, status, created_at, updated_at)
                 VALUES (?, ?, ?, ?, 'running', ?, ?)
                 """,
-                (job_id, user_id, goal, json.dumps(plan), now, now),
+                (job_id, user_id, goal, "[]" if self._plan_json_required else None, now, now),
+            )
+            conn.executemany(
+                "INSERT INTO plan_steps (job_id, step_no, text) VALUES (?, ?, ?)",
+                [(job_id, step_no, text) for step_no, text in enumerate(plan, start=1)],
             )
 
     def update_job_status(self, job_id: str, status: str) -> None:
-        with self.connect() as conn:
-            conn.execute(
-                "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?",
-                (status, datetime.utcnow().isoformat(), job_id),
-            )
+        with self._tx() as conn:
+            self._set_status(conn, job_id, status)
 
     def store_papers(self, job_id: str, papers: list[PaperRecord]) -> None:
-        with self.connect() as conn:
-            for idx, paper in enumerate(papers, start=1):
-                conn.execute(
-                    """
-                    INSERT INTO papers (job_id, rank_order, title, url, year, summary, raw_json)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        job_id,
-                        idx,
-                        paper.title,
-                        paper.url,
-                        paper.year,
-                        paper.summary,
-                        json.dumps(paper.raw),
-                    ),
+        with self._tx() as conn:
+            self._insert_papers(conn, job_id, papers)
+
+    def finalize_job(self, job_id: str, status: str, papers: list[PaperRecord]) -> None:
+        """Store papers and set the final job status with a single commit."""
+        with self._tx() as conn:
+            self._insert_papers(conn, job_id, papers)
+            self._set_status(conn, job_id, status)
+
+    @staticmethod
+    def _insert_user(conn: sqlite3.Connection, user_id: str, now: int | None = None) -> None:
+        conn.execute(
+            "INSERT OR IGNORE INTO users (user_id, created_at) VALUES (?, ?)",
+            (user_id, now or int(time.time())),
+        )
+
+    @staticmethod
+    def _set_status(conn: sqlite3.Connection, job_id: str, status: str) -> None:
+        conn.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE job_id = ?",
+            (status, int(time.time()), job_id),
+        )
+
+    @staticmethod
+    def _insert_papers(conn: sqlite3.Connection, job_id: str, papers: list[PaperRecord]) -> None:
+        conn.executemany(
+            """
+            INSERT INTO papers (job_id, rank_order, title, url, year, summary, raw_json)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    job_id,
+                    idx,
+                    paper.title,
+                    paper.url,
+                    paper.year,
+                    paper.summary,
+                    zlib.compress(orjson.dumps(paper.raw), RAW_COMPRESSION_LEVEL),
                 )
+                for idx, paper in enumerate(papers, start=1)
+            ],
+        )
+
+    def get_cached_summary(self, key: str, prompt_hash: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM summaries_cache WHERE key = ? AND prompt_hash = ?",
+                (key, prompt_hash),
+            ).fetchone()
+        return row["summary"] if row else None
+
+    def recent_summary_embeddings(self, prompt_hash: str, limit: int) -> list[tuple[str, bytes]]:
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT summary, embedding FROM summaries_cache
+                WHERE prompt_hash = ? AND embedding IS NOT NULL
+                ORDER BY created_at DESC LIMIT ?
+                """,
+                (prompt_hash, limit),
+            ).fetchall()
+        return [(row["summary"], row["embedding"]) for row in rows]
+
+    def put_cached_summary(
+        self, key: str, prompt_hash: str, summary: str, embedding: bytes | None = None
+    ) -> None:
+        with self._tx() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO summaries_cache (key, prompt_hash, summary, embedding, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, prompt_hash, summary, embedding, int(time.time())),
+            )
+
+    @staticmethod
+    def decode_raw(value: bytes | str) -> dict[str, Any]:
+        """Decode a ``papers.raw_json`` value, accepting legacy uncompressed text."""
+        if isinstance(value, bytes):
+            value = zlib.decompress(value)
+        return orjson.loads(value)
+
+    @staticmethod
+    def _legacy_plan(plan_json: str | None) -> list[str]:
+        """Plan of a job stored before plan_steps existed."""
+        return orjson.loads(plan_json) if plan_json else []
 
     def fetch_job_report(self, job_id: str) -> dict[str, Any]:
-        with self.connect() as conn:
-            job = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
-            papers = conn.execute(
+        with self._lock:
+            job = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            steps = self._conn.execute(
+                "SELECT text FROM plan_steps WHERE job_id = ? ORDER BY step_no",
+                (job_id,),
+            ).fetchall()
+            papers = self._conn.execute(
                 "SELECT rank_order, title, url, year, summary FROM papers WHERE job_id = ? ORDER BY rank_order",
                 (job_id,),
             ).fetchall()
@@ -140,6 +290,6 @@ class SQLiteStore:
             "user_id": job["user_id"],
             "goal": job["goal"],
             "status": job["status"],
-            "plan": json.loads(job["plan_json"]),
+            "plan": [row["text"] for row in steps] or self._legacy_plan(job["plan_json"]),
             "papers": [dict(row) for row in papers],
         }
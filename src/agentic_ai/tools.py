@@ -2,9 +2,38 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import re
+from contextlib import ExitStack
 from dataclasses import dataclass
-from typing import Protocol
+from functools import cache
+from typing import Any, Protocol
+
+import orjson
+
+SUMMARY_TEMPLATE = """
+You are summarizing AI research papers for an agriculture-focused analyst.
+Given title, snippet, url and year, produce a concise summary with:
+1) Problem statement
+2) Method overview
+3) Why it matters for agriculture
+4) One caveat
+Keep it <=120 words.
+
+Title: {title}
+Snippet: {snippet}
+URL: {url}
+Year: {year}
+""".strip()
+
+# Semantic cache: cosine similarity needed for a hit, and how many recent rows to scan.
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_SCAN = 500
+
+GOOGLE_CSE_URL = "https://www.googleapis.com/customsearch/v1"
+
+_YEAR_RE = re.compile(r"\b(20[1-2][0-9])\b")
 
 
 @dataclass(slots=True)
@@ -16,6 +45,10 @@ class SearchResult:
     snippet: str
     year: int | None
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return fields as a flat dict without ``dataclasses.asdict``'s deep copy."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class SearchTool(Protocol):
     """Protocol for interchangeable web search providers."""
@@ -24,10 +57,36 @@ class SearchTool(Protocol):
         """Return normalized search results."""
 
 
-def extract_year(text: str) -> int | None:
-    """Extract a plausible publication year from text."""
-    match = re.search(r"\b(20[1-2][0-9])\b", text)
-    return int(match.group(1)) if match else None
+class SummaryCache(Protocol):
+    """Protocol for persistent summary caches (see ``SQLiteStore``)."""
+
+    def get_cached_summary(self, key: str, prompt_hash: str) -> str | None:
+        """Return the summary stored under an exact key, if any."""
+
+    def recent_summary_embeddings(self, prompt_hash: str, limit: int) -> list[tuple[str, bytes]]:
+        """Return recent ``(summary, float32 embedding bytes)`` pairs."""
+
+    def put_cached_summary(
+        self, key: str, prompt_hash: str, summary: str, embedding: bytes | None = None
+    ) -> None:
+        """Store a summary and its optional embedding."""
+
+
+def extract_year(*texts: str) -> int | None:
+    """Extract a plausible publication year from the first text that has one."""
+    for text in texts:
+        match = _YEAR_RE.search(text)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+@cache
+def _http_client() -> Any:
+    """Process-wide HTTP/2 client so search calls reuse pooled TLS connections."""
+    import httpx
+
+    return httpx.Client(http2=True, timeout=10)
 
 
 class GoogleProgrammableSearchTool:
@@ -41,16 +100,25 @@ class GoogleProgrammableSearchTool:
         if not self.api_key or not self.cse_id:
             return []
 
-        from langchain_community.utilities import GoogleSearchAPIWrapper
+        import httpx
 
-        wrapper = GoogleSearchAPIWrapper(google_api_key=self.api_key, google_cse_id=self.cse_id)
-        rows = wrapper.results(query, min(max_results, 10))
+        # Transport, quota or credential errors yield no rows so the agent falls back to DuckDuckGo.
+        try:
+            response = _http_client().get(
+                GOOGLE_CSE_URL,
+                params={"key": self.api_key, "cx": self.cse_id, "q": query, "num": min(max_results, 10)},
+            )
+            if not response.is_success:
+                return []
+            rows = response.json().get("items", [])
+        except (httpx.HTTPError, ValueError):
+            return []
         results: list[SearchResult] = []
         for row in rows:
             title = row.get("title", "")
             url = row.get("link", "")
             snippet = row.get("snippet", "")
-            year = extract_year(f"{title} {snippet} {url}")
+            year = extract_year(title, snippet, url)
             if title and url:
                 results.append(SearchResult(title=title, url=url, snippet=snippet, year=year))
         return results
@@ -59,70 +127,175 @@ class GoogleProgrammableSearchTool:
 class DuckDuckGoSearchTool:
     """Fallback no-key search tool using DuckDuckGo's public interface."""
 
+    def __init__(self) -> None:
+        self._ddgs: Any = None
+        self._stack = ExitStack()
+
     def search(self, query: str, max_results: int = 12) -> list[SearchResult]:
-        from ddgs import DDGS
+        if self._ddgs is None:
+            from ddgs import DDGS
+
+            self._ddgs = self._stack.enter_context(DDGS())
+        rows = self._ddgs.text(query, max_results=max_results)
+        results: list[SearchResult] = []
+        for row in rows:
+            title = row.get("title", "")
+            snippet = row.get("body", "")
+            url = row.get("href", "")
+            year = extract_year(title, snippet, url)
+            if title and url:
+                results.append(SearchResult(title=title, url=url, snippet=snippet, year=year))
+        return results
+
+    def close(self) -> None:
+        """Release the pooled DuckDuckGo session."""
+        self._ddgs = None
+        self._stack.close()
 
-        with DDGS() as ddgs:
-            rows = ddgs.text(query, max_results=max_results)
-            results: list[SearchResult] = []
-            for row in rows:
-                title = row.get("title", "")
-                snippet = row.get("body", "")
-                url = row.get("href", "")
-                year = extract_year(f"{title} {snippet} {url}")
-                if title and url:
-                    results.append(SearchResult(title=title, url=url, snippet=snippet, year=year))
-            return results
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 class OllamaSummarizer:
-    """Summarizer backed by a local Ollama model."""
+    """Summarizer backed by a local Ollama model, with an optional summary cache.
 
-    def __init__(self, model: str) -> None:
-        from langchain_core.prompts import ChatPromptTemplate
+    Exact cache hits are keyed on a SHA256 of the search result. When
+    ``embedding_model`` is set, near-duplicate results are also matched by
+    cosine similarity of sentence-transformers embeddings.
+    """
+
+    def __init__(self, model: str, cache: SummaryCache | None = None, embedding_model: str = "") -> None:
+        from langchain_core.messages import HumanMessage
         from langchain_ollama import ChatOllama
 
         self.llm = ChatOllama(model=model, temperature=0)
-        self.prompt = ChatPromptTemplate.from_template(
-            """
-You are summarizing AI research papers for an agriculture-focused analyst.
-Given title, snippet, url and year, produce a concise summary with:
-1) Problem statement
-2) Method overview
-3) Why it matters for agriculture
-4) One caveat
-Keep it <=120 words.
-
-Title: {title}
-Snippet: {snippet}
-URL: {url}
-Year: {year}
-            """.strip()
-        )
+        self._human_message = HumanMessage
+        self.cache = cache
+        self.embedding_model = embedding_model
+        self._embedder: Any = None
+        self._prompt_hash = hashlib.sha256(f"{model}\n{SUMMARY_TEMPLATE}".encode()).hexdigest()
 
     def summarize(self, item: SearchResult) -> str:
         """Summarize one normalized search result."""
-        chain = self.prompt | self.llm
-        response = chain.invoke(
-            {
-                "title": item.title,
-                "snippet": item.snippet,
-                "url": item.url,
-                "year": item.year or "Unknown",
-            }
-        )
+        key = self._cache_key(item)
+        cached, embedding = self._lookup(item, key)
+        if cached is not None:
+            if embedding is not None:
+                self._remember(key, cached, embedding)
+            return cached
+        response = self.llm.invoke(self._messages(item))
+        summary = self._content(response)
+        self._remember(key, summary, embedding)
+        return summary
+
+    def summarize_many(self, items: list[SearchResult]) -> list[str]:
+        """Summarize several results, dispatching cache misses as one parallel batch."""
+        keys = [self._cache_key(item) for item in items]
+        lookups = [self._lookup(item, key) for item, key in zip(items, keys)]
+        misses = [idx for idx, (cached, _) in enumerate(lookups) if cached is None]
+        for key, (cached, embedding) in zip(keys, lookups):
+            if cached is not None and embedding is not None:
+                self._remember(key, cached, embedding)
+        summaries = [cached or "" for cached, _ in lookups]
+        if misses:
+            responses = self.llm.batch(
+                [self._messages(items[idx]) for idx in misses],
+                config={"max_concurrency": len(misses)},
+            )
+            for idx, response in zip(misses, responses):
+                summary = self._content(response)
+                self._remember(keys[idx], summary, lookups[idx][1])
+                summaries[idx] = summary
+        return summaries
+
+    @staticmethod
+    def _content(response: Any) -> str:
         return response.content if isinstance(response.content, str) else str(response.content)
 
+    def _messages(self, item: SearchResult) -> list[Any]:
+        """Fill the fixed prompt directly, skipping ChatPromptTemplate formatting."""
+        text = SUMMARY_TEMPLATE.format(
+            title=item.title,
+            snippet=item.snippet,
+            url=item.url,
+            year=item.year or "Unknown",
+        )
+        return [self._human_message(content=text)]
+
+    @staticmethod
+    def _cache_key(item: SearchResult) -> str:
+        payload = {"title": item.title, "url": item.url, "snippet": item.snippet, "year": item.year}
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def _lookup(self, item: SearchResult, key: str) -> tuple[str | None, bytes | None]:
+        """Return ``(cached summary, embedding bytes)`` without writing to the cache.
+
+        The embedding is set whenever the semantic tier ran; callers store it
+        with the new summary on a miss, or under this key on a semantic hit.
+        """
+        if self.cache is None:
+            return None, None
+        cached = self.cache.get_cached_summary(key, self._prompt_hash)
+        if cached is not None or not self.embedding_model:
+            return cached, None
+
+        import numpy as np
+
+        vector = self._embed(f"{item.title} {item.snippet}")
+        rows = [
+            (summary, blob)
+            for summary, blob in self.cache.recent_summary_embeddings(self._prompt_hash, SEMANTIC_CACHE_SCAN)
+            if len(blob) == vector.nbytes
+        ]
+        if rows:
+            matrix = np.frombuffer(b"".join(blob for _, blob in rows), dtype=np.float32)
+            scores = matrix.reshape(len(rows), -1) @ vector
+            best = int(scores.argmax())
+            if scores[best] >= SEMANTIC_CACHE_THRESHOLD:
+                return rows[best][0], vector.tobytes()
+        return None, vector.tobytes()
+
+    def _embed(self, text: str) -> Any:
+        import numpy as np
+
+        if self._embedder is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._embedder = SentenceTransformer(self.embedding_model)
+        vector = self._embedder.encode(text, normalize_embeddings=True)
+        return np.asarray(vector, dtype=np.float32)
+
+    def _remember(self, key: str, summary: str, embedding: bytes | None) -> None:
+        if self.cache is not None:
+            self.cache.put_cached_summary(key, self._prompt_hash, summary, embedding)
+
+
+_PAPER_TAGS = ("paper", "arxiv", "research", "journal")
+
+
+def _looks_like_paper(result: SearchResult) -> bool:
+    title = result.title.lower()
+    snippet = result.snippet.lower()
+    return any(tag in title or tag in snippet for tag in _PAPER_TAGS)
+
+
+def dedupe_by_url(results: list[SearchResult]) -> list[SearchResult]:
+    """Drop results whose normalized URL was already seen, keeping the first."""
+    seen: set[str] = set()
+    unique: list[SearchResult] = []
+    for result in results:
+        key = result.url.rstrip("/").lower()
+        if key not in seen:
+            seen.add(key)
+            unique.append(result)
+    return unique
+
 
 def pick_top_recent(results: list[SearchResult], k: int = 3) -> list[SearchResult]:
     """Heuristic selection of top-k AI+agriculture paper-like links by recency."""
-    filtered = [
-        result
-        for result in results
-        if any(
-            tag in (result.title + " " + result.snippet).lower()
-            for tag in ["paper", "arxiv", "research", "journal"]
-        )
-    ]
-    ranked = sorted(filtered or results, key=lambda item: (item.year or 0), reverse=True)
-    return ranked[:k]
+    results = dedupe_by_url(results)
+    filtered = [result for result in results if _looks_like_paper(result)]
+    return heapq.nlargest(k, filtered or results, key=lambda item: item.year or 0)
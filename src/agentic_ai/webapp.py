@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
-import json
-
+import orjson
 import streamlit as st
 
 from agentic_ai.agent import AgricultureResearchAgent
 from agentic_ai.config import settings
 
 
+def get_agent() -> AgricultureResearchAgent:
+    """Return this session's agent, built once and reused across reruns.
+
+    Each browser session gets its own agent because the search session and
+    summarizer are not thread-safe, and Streamlit runs sessions on separate threads.
+    """
+    if "agent" not in st.session_state:
+        st.session_state.agent = AgricultureResearchAgent(settings)
+    return st.session_state.agent
+
+
 st.set_page_config(page_title="Agentic AI - Agriculture Papers", layout="wide")
 st.title("Agentic AI: Agriculture Research Paper Finder")
 
@@ -21,14 +31,13 @@ goal = st.text_area(
 
 if st.button("Run Agent"):
     with st.spinner("Running autonomous workflow..."):
-        agent = AgricultureResearchAgent(settings)
-        report = agent.run(user_id=user_id, goal=goal)
+        report = get_agent().run(user_id=user_id, goal=goal)
     st.success("Completed")
     st.subheader("Structured Output")
     st.json(report)
     st.download_button(
         "Download JSON",
-        data=json.dumps(report, indent=2),
+        data=orjson.dumps(report, option=orjson.OPT_INDENT_2),
         file_name=f"{report['job_id']}.json",
         mime="application/json",
     )
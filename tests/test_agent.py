@@ -0,0 +1,32 @@
+from dataclasses import replace
+
+from agentic_ai.agent import AgricultureResearchAgent
+from agentic_ai.config import Settings
+from agentic_ai.tools import SearchResult
+
+
+class FakeSearch:
+    def search(self, query: str, max_results: int = 12) -> list[SearchResult]:
+        return [
+            SearchResult("old paper", "u1", "research", 2021),
+            SearchResult("new paper", "u2", "research", 2025),
+            SearchResult("mid paper", "u3", "research", 2023),
+            SearchResult("recent paper", "u4", "research", 2024),
+        ]
+
+
+class FakeSummarizer:
+    def summarize_many(self, items: list[SearchResult]) -> list[str]:
+        return [f"summary of {item.title}" for item in items]
+
+
+def test_run_stores_top_three_papers(tmp_path) -> None:
+    settings = replace(Settings(), sqlite_path=str(tmp_path / "runs.db"), search_provider="duckduckgo")
+    agent = AgricultureResearchAgent(settings)
+    agent.search_tool = FakeSearch()
+    agent.summarizer = FakeSummarizer()
+
+    report = agent.run(user_id="alice", goal="find papers")
+    assert report["status"] == "completed"
+    assert [p["year"] for p in report["papers"]] == [2025, 2024, 2023]
+    assert report["papers"][0]["summary"] == "summary of new paper"
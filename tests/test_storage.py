@@ -0,0 +1,88 @@
+import sqlite3
+
+from agentic_ai.storage import PaperRecord, SQLiteStore
+
+
+def test_job_roundtrip(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "runs.db"))
+    store.create_job(job_id="j1", user_id="alice", goal="goal", plan=["a", "b"])
+    papers = [
+        PaperRecord("first", "u1", 2025, "s1", {"title": "first"}),
+        PaperRecord("second", "u2", None, "s2", {"title": "second"}),
+    ]
+    store.finalize_job("j1", "completed", papers)
+
+    report = store.fetch_job_report("j1")
+    assert report["status"] == "completed"
+    assert report["plan"] == ["a", "b"]
+    assert [(p["rank_order"], p["title"]) for p in report["papers"]] == [(1, "first"), (2, "second")]
+
+
+def test_summary_cache_is_scoped_by_prompt_hash(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "runs.db"))
+    store.put_cached_summary("k1", "p1", "cached", b"\x00\x00\x80?")
+    assert store.get_cached_summary("k1", "p1") == "cached"
+    assert store.get_cached_summary("k1", "p2") is None
+
+    store.put_cached_summary("k1", "p2", "other model")
+    assert store.get_cached_summary("k1", "p1") == "cached"
+    assert store.get_cached_summary("k1", "p2") == "other model"
+    assert store.recent_summary_embeddings("p1", limit=5) == [("cached", b"\x00\x00\x80?")]
+
+
+def test_raw_payload_is_stored_compressed(tmp_path) -> None:
+    store = SQLiteStore(str(tmp_path / "runs.db"))
+    store.create_job(job_id="j1", user_id="alice", goal="goal", plan=[])
+    store.store_papers("j1", [PaperRecord("t", "u", 2024, "s", {"title": "t", "year": 2024})])
+
+    (raw,) = store._conn.execute("SELECT raw_json FROM papers").fetchone()
+    assert isinstance(raw, bytes)
+    assert SQLiteStore.decode_raw(raw) == {"title": "t", "year": 2024}
+    assert SQLiteStore.decode_raw('{"legacy": true}') == {"legacy": True}
+
+
+def test_reads_plans_from_legacy_schema(tmp_path) -> None:
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE jobs (
+                job_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, goal TEXT NOT NULL,
+                plan_json TEXT NOT NULL, status TEXT NOT NULL,
+                created_at TEXT NOT NULL, updated_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute("INSERT INTO jobs VALUES ('old', 'alice', 'g', '[\"step\"]', 'completed', '', '')")
+    conn.close()
+
+    store = SQLiteStore(str(db_path))
+    store.create_job(job_id="new", user_id="alice", goal="g", plan=["a", "b"])
+    assert store.fetch_job_report("old")["plan"] == ["step"]
+    assert store.fetch_job_report("new")["plan"] == ["a", "b"]
+
+
+def test_legacy_iso_timestamps_are_converted_to_epochs(tmp_path) -> None:
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE users (user_id TEXT PRIMARY KEY, created_at TEXT NOT NULL)")
+        conn.execute("INSERT INTO users VALUES ('alice', '2020-01-01T00:00:00.123456')")
+    conn.close()
+
+    store = SQLiteStore(str(db_path))
+    store.ensure_user("bob")
+    rows = store._conn.execute("SELECT user_id, created_at FROM users ORDER BY created_at").fetchall()
+    assert [(row["user_id"], int(row["created_at"])) for row in rows][0] == ("alice", 1577836800)
+    assert rows[1]["user_id"] == "bob"
+
+
+def test_rollback_journal_database_is_rebuilt_with_larger_pages(tmp_path) -> None:
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA page_size=4096")
+        conn.execute("CREATE TABLE users (user_id TEXT PRIMARY KEY, created_at TEXT NOT NULL)")
+    conn.close()
+
+    store = SQLiteStore(str(db_path))
+    assert store._conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+    assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
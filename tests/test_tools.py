@@ -1,9 +1,55 @@
-from agentic_ai.tools import GoogleProgrammableSearchTool, SearchResult, extract_year, pick_top_recent
+import sys
+from types import ModuleType, SimpleNamespace
+
+import httpx
+import pytest
+
+from agentic_ai import tools
+from agentic_ai.storage import SQLiteStore
+from agentic_ai.tools import (
+    DuckDuckGoSearchTool,
+    GoogleProgrammableSearchTool,
+    OllamaSummarizer,
+    SearchResult,
+    extract_year,
+    pick_top_recent,
+)
+
+
+class FakeChatOllama:
+    def __init__(self, **kwargs) -> None:
+        self.prompts: list[str] = []
+
+    def invoke(self, messages: list) -> SimpleNamespace:
+        self.prompts.append(messages[0].content)
+        return SimpleNamespace(content=f"summary {len(self.prompts)}")
+
+    def batch(self, inputs: list[list], config: dict) -> list[SimpleNamespace]:
+        return [self.invoke(messages) for messages in inputs]
+
+
+class FakeEmbedder:
+    def __init__(self, vectors: dict[str, list[float]]) -> None:
+        self.vectors = vectors
+
+    def encode(self, text: str, normalize_embeddings: bool) -> list[float]:
+        return self.vectors[text]
+
+
+def make_summarizer(monkeypatch, tmp_path, embedding_model: str = "") -> OllamaSummarizer:
+    messages = ModuleType("langchain_core.messages")
+    messages.HumanMessage = SimpleNamespace
+    monkeypatch.setitem(sys.modules, "langchain_core", ModuleType("langchain_core"))
+    monkeypatch.setitem(sys.modules, "langchain_core.messages", messages)
+    monkeypatch.setitem(sys.modules, "langchain_ollama", SimpleNamespace(ChatOllama=FakeChatOllama))
+    store = SQLiteStore(str(tmp_path / "runs.db"))
+    return OllamaSummarizer("test-model", cache=store, embedding_model=embedding_model)
 
 
 def test_extract_year() -> None:
     assert extract_year("Paper 2024 on crop yield") == 2024
     assert extract_year("No year") is None
+    assert extract_year("No year", "see 2019 and 2024", "https://x/2025") == 2019
 
 
 def test_pick_top_recent() -> None:
@@ -19,3 +65,138 @@ def test_pick_top_recent() -> None:
 def test_google_search_returns_empty_without_credentials() -> None:
     tool = GoogleProgrammableSearchTool(api_key="", cse_id="")
     assert tool.search("ai agriculture", max_results=3) == []
+
+
+class FakeHttpClient:
+    def __init__(self, response: httpx.Response | Exception) -> None:
+        self.response = response
+        self.params: dict = {}
+
+    def get(self, url: str, params: dict) -> httpx.Response:
+        self.params = params
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+def test_google_search_normalizes_rows(monkeypatch) -> None:
+    body = {
+        "items": [
+            {"title": "Crop paper 2024", "link": "https://x/1", "snippet": "research"},
+            {"title": "", "link": "https://x/2", "snippet": "no title"},
+        ]
+    }
+    client = FakeHttpClient(httpx.Response(200, json=body))
+    monkeypatch.setattr(tools, "_http_client", lambda: client)
+
+    rows = GoogleProgrammableSearchTool(api_key="k", cse_id="c").search("ai agriculture", max_results=12)
+    assert rows == [SearchResult("Crop paper 2024", "https://x/1", "research", 2024)]
+    assert client.params["num"] == 10
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(403, json={"error": "quota"}),
+        httpx.Response(200, text="<html>not json</html>"),
+        httpx.ConnectError("down"),
+        httpx.ReadTimeout("slow"),
+    ],
+)
+def test_google_search_failures_return_empty(monkeypatch, response) -> None:
+    monkeypatch.setattr(tools, "_http_client", lambda: FakeHttpClient(response))
+    assert GoogleProgrammableSearchTool(api_key="k", cse_id="c").search("ai agriculture") == []
+
+
+def test_search_result_to_dict() -> None:
+    row = SearchResult("t", "u", "s", 2024)
+    assert row.to_dict() == {"title": "t", "url": "u", "snippet": "s", "year": 2024}
+
+
+def test_pick_top_recent_skips_duplicate_urls() -> None:
+    rows = [
+        SearchResult("new paper", "https://arxiv.org/abs/1", "research", 2025),
+        SearchResult("new paper (mirror)", "https://ARXIV.org/abs/1/", "research", 2025),
+        SearchResult("mid paper", "https://arxiv.org/abs/2", "research", 2023),
+    ]
+    top = pick_top_recent(rows, k=2)
+    assert [x.title for x in top] == ["new paper", "mid paper"]
+
+
+def test_summarize_writes_misses_and_serves_exact_hits(monkeypatch, tmp_path) -> None:
+    summarizer = make_summarizer(monkeypatch, tmp_path)
+    item = SearchResult("t", "u", "s", 2024)
+
+    assert summarizer.summarize(item) == "summary 1"
+    assert summarizer.cache.get_cached_summary(summarizer._cache_key(item), summarizer._prompt_hash) == "summary 1"
+    assert summarizer.summarize(item) == "summary 1"
+    assert len(summarizer.llm.prompts) == 1
+
+
+def test_summarize_semantic_hit_is_stored_under_new_key(monkeypatch, tmp_path) -> None:
+    np = pytest.importorskip("numpy")
+    summarizer = make_summarizer(monkeypatch, tmp_path, embedding_model="fake")
+    summarizer._embedder = FakeEmbedder(
+        {"a s": [1.0, 0.0], "b s": [0.99, 0.141], "c s": [0.0, 1.0], "d s": [0.98, 0.199]}
+    )
+    # A stale row from another embedding model has a different size and must be skipped.
+    summarizer.cache.put_cached_summary("stale", summarizer._prompt_hash, "stale", np.ones(3, np.float32).tobytes())
+
+    first = SearchResult("a", "u1", "s", 2024)
+    near = SearchResult("b", "u2", "s", 2024)
+    far = SearchResult("c", "u3", "s", 2024)
+    assert summarizer.summarize(first) == "summary 1"
+    assert summarizer.summarize(near) == "summary 1"
+    assert summarizer.cache.get_cached_summary(summarizer._cache_key(near), summarizer._prompt_hash) == "summary 1"
+    assert summarizer.summarize(far) == "summary 2"
+    assert len(summarizer.llm.prompts) == 2
+
+    batched = SearchResult("d", "u4", "s", 2024)
+    assert summarizer.summarize_many([batched]) == ["summary 1"]
+    assert summarizer.cache.get_cached_summary(summarizer._cache_key(batched), summarizer._prompt_hash) == "summary 1"
+    assert len(summarizer.llm.prompts) == 2
+
+
+def test_summarize_many_merges_hits_and_batched_misses_in_order(monkeypatch, tmp_path) -> None:
+    summarizer = make_summarizer(monkeypatch, tmp_path)
+    items = [SearchResult(title, f"u-{title}", "s", 2024) for title in ("a", "b", "c", "d")]
+    for item in (items[0], items[2]):
+        summarizer.cache.put_cached_summary(summarizer._cache_key(item), summarizer._prompt_hash, f"cached {item.title}")
+
+    assert summarizer.summarize_many(items) == ["cached a", "summary 1", "cached c", "summary 2"]
+    prompts = summarizer.llm.prompts
+    assert len(prompts) == 2 and "Title: b" in prompts[0] and "Title: d" in prompts[1]
+    for item, expected in zip(items, ["cached a", "summary 1", "cached c", "summary 2"]):
+        assert summarizer.cache.get_cached_summary(summarizer._cache_key(item), summarizer._prompt_hash) == expected
+    assert summarizer.summarize_many([]) == []
+
+
+def test_duckduckgo_reuses_one_session(monkeypatch) -> None:
+    sessions: list = []
+
+    class FakeDDGS:
+        def __init__(self) -> None:
+            self.queries: list[str] = []
+            self.closed = False
+            sessions.append(self)
+
+        def __enter__(self) -> "FakeDDGS":
+            return self
+
+        def __exit__(self, *exc_info: object) -> None:
+            self.closed = True
+
+        def text(self, query: str, max_results: int) -> list[dict]:
+            self.queries.append(query)
+            return [{"title": "Paper 2024", "body": "research", "href": "https://x/1"}]
+
+    monkeypatch.setitem(sys.modules, "ddgs", SimpleNamespace(DDGS=FakeDDGS))
+    tool = DuckDuckGoSearchTool()
+    assert [r.year for r in tool.search("a")] == [2024]
+    tool.search("b")
+    assert len(sessions) == 1 and sessions[0].queries == ["a", "b"]
+
+    tool.close()
+    assert sessions[0].closed
+    tool.search("c")
+    assert len(sessions) == 2